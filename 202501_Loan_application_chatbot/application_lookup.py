@@ -0,0 +1,53 @@
+"""Deterministic application lookup: pattern-based ID extraction and an in-memory index over the CSV."""
+
+import csv
+import re
+
+# "application id is 2", "application_id: 3", "app #4", "application number 5"; an ID keyword is required,
+# so "my application 3 days ago" is not read as application 3
+APPLICATION_ID_PATTERN = re.compile(
+    r"\b(?:application|app)[\s_-]*(?:id\b|number\b|no\b\.?|#)\s*(?:is|:|=)?\s*#?\s*(\d+)\b", re.IGNORECASE)
+# "id 7", "ID: 7", "my id is 7"; only at the start of a sentence or after my/the, so other IDs
+# ("customer id 3", "transaction ID: 2") are not read as application IDs
+BARE_ID_PATTERN = re.compile(r"(?:^|[.!?]|\b(?:my|the))\s*\bid\s*(?:is|:|=)?\s*#?\s*(\d+)\b", re.IGNORECASE)
+# anything that might still carry an ID the patterns missed, e.g. "my id is three"
+ID_HINT_PATTERN = re.compile(r"\d|\bid\b|\bnumber\b", re.IGNORECASE)
+NUMBER_PATTERN = re.compile(r"\d+")
+
+
+def load_application_index(csv_path: str, delimiter: str = ";") -> dict[str, dict]:
+    """Read the applications CSV once into a dict keyed by application_id"""
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        return {row["application_id"].strip(): row for row in csv.DictReader(f, delimiter=delimiter)}
+
+
+def match_application_id(query: str) -> tuple[str, str | None]:
+    """Classify a query by the application IDs it mentions.
+
+    Returns ("found", id) for exactly one ID and no other number in the query, ("none", None) when
+    the query has no sign of an ID at all, and ("ambiguous", None) otherwise (several IDs, other
+    numbers such as "3 days ago", or hints the patterns can't parse).
+    """
+    ids = set(APPLICATION_ID_PATTERN.findall(query)) | set(BARE_ID_PATTERN.findall(query))
+    if len(ids) == 1 and set(NUMBER_PATTERN.findall(query)) == ids:
+        return "found", ids.pop()
+    if not ids and not ID_HINT_PATTERN.search(query):
+        return "none", None
+    return "ambiguous", None
+
+
+def format_application(row: dict) -> str:
+    """Customer-facing answer for one application row"""
+    application_id = row["application_id"].strip()
+    status = row["application_status"].strip()
+    response = (f"Thank you for providing your application ID. Here is the specific information for "
+                f"Application ID {application_id}: The status of your application is {status}.")
+    if row.get("rules"):
+        response += f' The reason for the decline is "{row["rules"].strip()}".'
+    return response
+
+
+def format_unknown_application(application_id: str) -> str:
+    """Customer-facing answer for an ID that is not in the index (never another applicant's data)"""
+    return (f"Sorry, we couldn't find an application with ID {application_id}. "
+            f"Please check the ID and try again.")
@@ -0,0 +1,174 @@
+"""Persistent embedding index for loan application records, updated incrementally by row hash."""
+
+import hashlib
+import json
+import os
+from typing import Any
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+
+def embedding_identity(embedding) -> str:
+    """Backend class, model name and configured size, e.g. 'OpenAIEmbeddings:text-embedding-ada-002'"""
+    parts = [type(embedding).__name__]
+    for attr in ("model", "model_name", "dimensions", "size"):
+        if getattr(embedding, attr, None) is not None:
+            parts.append(str(getattr(embedding, attr)))
+    return ":".join(parts)
+
+
+def row_text(row: dict) -> str:
+    """Document text for a CSV row, in the same "column: value" form CSVLoader produces"""
+    return "\n".join(f"{key}: {(value or '').strip()}" for key, value in row.items())
+
+
+class ApplicationEmbeddingIndex:
+    """On-disk vector index keyed by application_id.
+
+    Files in `index_dir`:
+    - vectors.f32: append-only float32 matrix of unit vectors, memory-mapped for search
+    - meta.json: embedding identity and dimension, slot count and {application_id: [slot, row_hash]}
+
+    `sync` hashes every row and only embeds inserted or changed rows, in batches. Changed rows are
+    appended to a new slot and deleted rows are dropped from the metadata; the dead slots they leave
+    behind are reclaimed by `compact` once they exceed `compact_ratio` of the file. An index built
+    with another embedding model (`embedding_id`, by default from the backend) is rebuilt from scratch.
+
+    Any LangChain `Embeddings` works as the backend, e.g. `DeterministicFakeEmbedding` for tests.
+    """
+
+    def __init__(self, index_dir: str, embedding, batch_size: int = 256, compact_ratio: float = 0.25,
+                 embedding_id: str = None):
+        self.index_dir = index_dir
+        self.embedding = embedding
+        self.embedding_id = embedding_id or embedding_identity(embedding)
+        self.batch_size = batch_size
+        self.compact_ratio = compact_ratio
+        self.vectors_path = os.path.join(index_dir, "vectors.f32")
+        self.meta_path = os.path.join(index_dir, "meta.json")
+        self.texts: dict[str, str] = {}
+        self.vectors = None
+        self.slot_ids = np.array([], dtype=object)
+        self.live = np.array([], dtype=bool)
+
+        os.makedirs(index_dir, exist_ok=True)
+        self.meta = {"embedding": self.embedding_id, "dim": None, "n_slots": 0, "rows": {}}
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("embedding") == self.embedding_id:
+                self.meta = meta
+        # a new or rebuilt index starts with an empty vector file (the next append truncates it)
+        self._open()
+
+    def sync(self, rows: dict[str, dict]) -> dict[str, int]:
+        """Bring the index in line with `rows` ({application_id: row}) and return what changed"""
+        self.texts = {app_id: row_text(row) for app_id, row in rows.items()}
+        hashes = {app_id: hashlib.sha256(text.encode()).hexdigest() for app_id, text in self.texts.items()}
+        indexed = self.meta["rows"]
+
+        deleted = [app_id for app_id in indexed if app_id not in rows]
+        changed = [app_id for app_id, row_hash in hashes.items() if indexed.get(app_id, [None, None])[1] != row_hash]
+        stats = {
+            "inserted": sum(app_id not in indexed for app_id in changed),
+            "updated": sum(app_id in indexed for app_id in changed),
+            "deleted": len(deleted),
+            "unchanged": len(rows) - len(changed),
+        }
+
+        for app_id in deleted:
+            del indexed[app_id]
+        for start in range(0, len(changed), self.batch_size):
+            batch = changed[start:start + self.batch_size]
+            slots = self._append(self.embedding.embed_documents([self.texts[app_id] for app_id in batch]))
+            for app_id, slot in zip(batch, slots):
+                indexed[app_id] = [slot, hashes[app_id]]
+            self._save_meta()  # after every batch, so an interrupted sync resumes where it stopped
+        if deleted:
+            self._save_meta()
+
+        self._open()
+        dead = self.meta["n_slots"] - len(indexed)
+        if self.meta["n_slots"] and dead / self.meta["n_slots"] > self.compact_ratio:
+            self.compact()
+        return stats
+
+    def similarity_search(self, query: str, k: int = 4) -> list[Document]:
+        if self.vectors is None or not len(self.vectors):
+            return []
+        q = np.asarray(self.embedding.embed_query(query), dtype=np.float32)
+        scores = self.vectors @ (q / (np.linalg.norm(q) or 1.0))
+        scores[~self.live] = -np.inf
+        top = np.argsort(-scores)[:k]
+        return [
+            Document(page_content=self.texts.get(self.slot_ids[slot], ""),
+                     metadata={"application_id": self.slot_ids[slot], "score": float(scores[slot])})
+            for slot in top if self.live[slot]
+        ]
+
+    def as_retriever(self, k: int = 4) -> "ApplicationRetriever":
+        return ApplicationRetriever(index=self, k=k)
+
+    def compact(self):
+        """Rewrite the vector file with live slots only"""
+        live = sorted(self.meta["rows"].values(), key=lambda entry: entry[0])
+        tmp_path = self.vectors_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            for start in range(0, len(live), 10_000):
+                chunk = live[start:start + 10_000]
+                f.write(np.ascontiguousarray(self.vectors[[entry[0] for entry in chunk]]).tobytes())
+        for new_slot, entry in enumerate(live):
+            entry[0] = new_slot
+        self.vectors = None  # release the memory map before replacing the file
+        os.replace(tmp_path, self.vectors_path)
+        self.meta["n_slots"] = len(live)
+        self._save_meta()
+        self._open()
+
+    def _append(self, embeddings: list[list[float]]) -> list[int]:
+        vecs = np.asarray(embeddings, dtype=np.float32)
+        vecs /= np.maximum(np.linalg.norm(vecs, axis=1, keepdims=True), 1e-12)
+        if self.meta["dim"] is None:
+            self.meta["dim"] = vecs.shape[1]
+        if vecs.shape[1] != self.meta["dim"]:
+            raise ValueError(f"embedding dimension {vecs.shape[1]} does not match the index ({self.meta['dim']}); "
+                             f"pass a different embedding_id to rebuild it")
+
+        start = self.meta["n_slots"]
+        with open(self.vectors_path, "ab") as f:
+            # drop bytes from an append that never made it into meta.json
+            f.truncate(start * self.meta["dim"] * 4)
+            f.write(vecs.tobytes())
+        self.meta["n_slots"] = start + len(vecs)
+        return list(range(start, start + len(vecs)))
+
+    def _save_meta(self):
+        tmp_path = self.meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def _open(self):
+        n_slots, dim = self.meta["n_slots"], self.meta["dim"]
+        self.slot_ids = np.full(n_slots, None, dtype=object)
+        self.live = np.zeros(n_slots, dtype=bool)
+        if not n_slots:
+            self.vectors = None
+            return
+        self.vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(n_slots, dim))
+        for app_id, (slot, _) in self.meta["rows"].items():
+            self.slot_ids[slot] = app_id
+            self.live[slot] = True
+
+
+class ApplicationRetriever(BaseRetriever):
+    """LangChain retriever over an ApplicationEmbeddingIndex"""
+
+    index: Any
+    k: int = 4
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> list[Document]:
+        return self.index.similarity_search(query, self.k)
@@ -0,0 +1,121 @@
+"""Load test for session_server.py against a stub LLM: reply latency at N concurrent customer sessions."""
+
+import argparse
+import asyncio
+import time
+
+import aiohttp
+import numpy as np
+import pandas as pd
+from aiohttp import web
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from application_lookup import load_application_index
+from session_server import CSV_PATH, SessionServer
+
+CONVERSATION = [
+    "Hi, my name is andy",
+    "Why was my application declined?",
+    "my application id is 2",
+    "I am not happy with that, what can I do to improve my chances next time?",
+    "What is my name?",
+]
+
+
+class StubChatModel(BaseChatModel):
+    """Answers every prompt after a fixed delay; counts tokens as whitespace-separated words"""
+
+    latency: float = 0.2
+    reply_words: int = 40
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _result(self) -> ChatResult:
+        self.calls += 1
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=" ".join(["word"] * self.reply_words)))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        return self._result()
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._result()
+
+    def get_num_tokens(self, text: str) -> int:
+        return len(text.split())
+
+
+async def run_load(url: str, n_sessions: int, turns: int, think_time: float) -> list[float]:
+    """Each of n_sessions customers sends `turns` messages, pausing think_time between them; returns reply latencies"""
+    latencies = []
+
+    async def customer(http: aiohttp.ClientSession, customer_id: int):
+        for turn in range(turns):
+            start = time.perf_counter()
+            async with http.post(f"{url}/chat", json={"customer_id": customer_id,
+                                                      "message": CONVERSATION[turn % len(CONVERSATION)]}) as r:
+                await r.json()
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(think_time)
+
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector) as http:
+        await asyncio.gather(*(customer(http, i) for i in range(n_sessions)))
+    return latencies
+
+
+async def measure(n_sessions: int, turns: int, background_summary: bool, args) -> dict:
+    llm = StubChatModel(latency=args.latency)
+    server = SessionServer(llm, load_application_index(CSV_PATH), max_sessions=args.max_sessions,
+                           max_concurrency=args.max_concurrency, background_summary=background_summary)
+    runner = web.AppRunner(server.make_app())
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    port = runner.addresses[0][1]
+
+    start = time.perf_counter()
+    latencies = await run_load(f"http://127.0.0.1:{port}", n_sessions, turns, args.think_time)
+    wall = time.perf_counter() - start
+    await runner.cleanup()  # drains the background memory updates
+
+    ms = np.array(latencies) * 1000
+    return {
+        "sessions": n_sessions,
+        "summary": "background" if background_summary else "inline",
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "replies_per_s": len(latencies) / wall,
+        "llm_calls": llm.calls,
+        "fast_path_hits": server.fast_path_hits,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", default="1,10,50,200", help="comma separated concurrent session counts")
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2, help="stub LLM seconds per call")
+    parser.add_argument("--think-time", type=float, default=0.5, help="customer seconds between messages")
+    parser.add_argument("--max-concurrency", type=int, default=32)
+    parser.add_argument("--max-sessions", type=int, default=1000)
+    args = parser.parse_args()
+
+    results = []
+    for n_sessions in map(int, args.sessions.split(",")):
+        for background_summary in (False, True):
+            results.append(await measure(n_sessions, args.turns, background_summary, args))
+
+    print(f"{args.turns} turns per session, stub latency {args.latency * 1000:.0f} ms, "
+          f"think time {args.think_time * 1000:.0f} ms, "
+          f"max_concurrency {args.max_concurrency}\n")
+    print(pd.DataFrame(results).round(1).to_string(index=False))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
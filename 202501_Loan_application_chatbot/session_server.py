@@ -0,0 +1,183 @@
+"""Asyncio chat server for the loan chatbot: one summary memory per customer, updated after the reply is sent."""
+
+import argparse
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+
+from aiohttp import web
+from langchain.memory import ConversationSummaryBufferMemory
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+
+from application_lookup import (format_application, format_unknown_application, load_application_index,
+                                match_application_id)
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "loan_applications.csv")
+
+# Same instructions as the notebook's customer service prompt, plus the customer's rolling summary
+PROMPT = PromptTemplate(input_variables=["history", "question"], template="""
+You are a professional customer service representative for a financial institution. Your tone should always be polite, clear and precise.
+
+Please only if necessary, retrieve application-related data (such as application status, the reason for decline) to give a complete response.
+To do that, you need to ask for application_id first so that you can locate the correct info.
+
+If you don't know the answer, admit it and refer the customer for human support.
+
+Conversation so far: {history}
+
+Customer Query: "{question}"
+""")
+
+log = logging.getLogger(__name__)
+
+
+class ChatSession:
+    """Memory of one customer plus what's needed to keep their turns in order"""
+
+    def __init__(self, memory: ConversationSummaryBufferMemory):
+        self.memory = memory
+        self.lock = asyncio.Lock()  # one turn at a time per customer
+        self.pending: asyncio.Task | None = None  # memory update of the previous turn
+
+    @property
+    def busy(self) -> bool:
+        """A turn or its memory update is still running"""
+        return self.lock.locked() or (self.pending is not None and not self.pending.done())
+
+
+class SessionStore:
+    """LRU store of chat sessions; the least recently used idle customer is evicted beyond max_sessions.
+    Busy sessions are never evicted, so the store can briefly exceed max_sessions under load."""
+
+    def __init__(self, make_memory, max_sessions: int = 1000):
+        self.make_memory = make_memory
+        self.max_sessions = max_sessions
+        self.evictions = 0
+        self._sessions: OrderedDict[str, ChatSession] = OrderedDict()
+
+    def get(self, customer_id: str) -> ChatSession:
+        session = self._sessions.get(customer_id)
+        if session is None:
+            session = self._sessions[customer_id] = ChatSession(self.make_memory())
+            excess = len(self._sessions) - self.max_sessions
+            if excess > 0:
+                idle = [cid for cid, s in self._sessions.items() if cid != customer_id and not s.busy]
+                for cid in idle[:excess]:
+                    del self._sessions[cid]
+                    self.evictions += 1
+        else:
+            self._sessions.move_to_end(customer_id)
+        return session
+
+    def drop(self, customer_id: str) -> bool:
+        return self._sessions.pop(customer_id, None) is not None
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+class SessionServer:
+    """Answers customer messages concurrently with at most max_concurrency LLM calls in flight.
+
+    The reply only waits for the LLM answer. Saving the turn to memory (which triggers the rolling
+    summary call once the buffer exceeds max_token_limit) runs as a background task afterwards; the
+    customer's next turn waits for it so it always sees the updated summary.
+    With background_summary=False the summary runs before the reply returns, as in the notebook.
+    """
+
+    def __init__(self, llm, application_index: dict[str, dict] = None, max_sessions: int = 1000,
+                 max_concurrency: int = 8, max_token_limit: int = 100, background_summary: bool = True):
+        self.llm = llm
+        self.application_index = application_index or {}
+        self.chain = PROMPT | llm | StrOutputParser()
+        self.sessions = SessionStore(
+            lambda: ConversationSummaryBufferMemory(llm=llm, max_token_limit=max_token_limit), max_sessions)
+        self.llm_slots = asyncio.Semaphore(max_concurrency)
+        self.background_summary = background_summary
+        self.llm_calls = 0
+        self.fast_path_hits = 0
+        self._tasks: set[asyncio.Task] = set()
+
+    async def reply(self, customer_id: str, message: str) -> str:
+        session = self.sessions.get(customer_id)
+        async with session.lock:
+            if session.pending:
+                await session.pending
+
+            match, application_id = match_application_id(message)
+            if match == "found":
+                self.fast_path_hits += 1
+                row = self.application_index.get(application_id)
+                response = format_application(row) if row else format_unknown_application(application_id)
+            else:
+                history = session.memory.load_memory_variables({})["history"]
+                async with self.llm_slots:
+                    self.llm_calls += 1
+                    response = await self.chain.ainvoke({"history": history, "question": message})
+
+            update = self._remember(session, message, response)
+            if self.background_summary:
+                session.pending = asyncio.create_task(update)
+                self._tasks.add(session.pending)
+                session.pending.add_done_callback(self._tasks.discard)
+            else:
+                await update
+        return response
+
+    async def _remember(self, session: ChatSession, message: str, response: str):
+        try:
+            async with self.llm_slots:
+                await session.memory.asave_context({"input": message}, {"output": response})
+        except Exception:
+            log.exception("memory update failed")
+
+    async def drain(self):
+        """Wait for all background memory updates"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks))
+
+    def make_app(self) -> web.Application:
+        async def chat(request: web.Request) -> web.Response:
+            try:
+                payload = await request.json()
+                customer_id, message = str(payload["customer_id"]), payload["message"]
+            except Exception as e:
+                return web.json_response({"error": f"expected customer_id and message: {e}"}, status=400)
+            return web.json_response({"reply": await self.reply(customer_id, message)})
+
+        async def reset(request: web.Request) -> web.Response:
+            return web.json_response({"dropped": self.sessions.drop(request.match_info["customer_id"])})
+
+        async def health(request: web.Request) -> web.Response:
+            return web.json_response({
+                "status": "ok", "sessions": len(self.sessions), "evictions": self.sessions.evictions,
+                "pending_summaries": len(self._tasks), "llm_calls": self.llm_calls,
+                "fast_path_hits": self.fast_path_hits,
+            })
+
+        async def on_cleanup(app: web.Application):
+            await self.drain()
+
+        app = web.Application()
+        app.add_routes([web.post("/chat", chat), web.delete("/sessions/{customer_id}", reset),
+                        web.get("/health", health)])
+        app.on_cleanup.append(on_cleanup)
+        return app
+
+
+if __name__ == "__main__":
+    from langchain_community.chat_models import ChatOpenAI
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--model", default="gpt-3.5-turbo-0125")
+    parser.add_argument("--max-sessions", type=int, default=1000)
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    llm = ChatOpenAI(temperature=0.0, model=args.model, openai_api_key=os.environ["OPENAI_API_KEY"])
+    server = SessionServer(llm, load_application_index(CSV_PATH), args.max_sessions, args.max_concurrency)
+    web.run_app(server.make_app(), host=args.host, port=args.port)
@@ -0,0 +1,29 @@
+import pytest
+
+from application_lookup import match_application_id
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("What is the status of application id 2?", ("found", "2")),
+    ("application_id: 3", ("found", "3")),
+    ("app #4 please", ("found", "4")),
+    ("application number 5", ("found", "5")),
+    ("My ID is 7", ("found", "7")),
+    ("ID 8, what's the status?", ("found", "8")),
+    ("Hi. The id is 9", ("found", "9")),
+    ("How do I apply for a loan?", ("none", None)),
+    # numbers that are not application IDs must never reach the fast path
+    ("I sent my application 3 days ago, any news?", ("ambiguous", None)),
+    ("I submitted the app 2 weeks ago", ("ambiguous", None)),
+    ("Can I get a loan of 5000?", ("ambiguous", None)),
+    ("application id 2 and 3", ("ambiguous", None)),
+    ("application id 2, sent 3 days ago", ("ambiguous", None)),
+    ("id 2 or id 3", ("ambiguous", None)),
+    ("my id is three", ("ambiguous", None)),
+    ("I lost my credit card, my customer id is 3", ("ambiguous", None)),
+    ("My transaction ID: 2 was charged twice", ("ambiguous", None)),
+    ("what is my account id 4 balance", ("ambiguous", None)),
+    ("card id 5 is blocked", ("ambiguous", None)),
+])
+def test_match_application_id(query, expected):
+    assert match_application_id(query) == expected
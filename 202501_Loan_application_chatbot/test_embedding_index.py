@@ -0,0 +1,114 @@
+import json
+import os
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from embedding_index import ApplicationEmbeddingIndex, row_text
+
+
+class CountingEmbedding(DeterministicFakeEmbedding):
+    """Fake backend that records every text it embeds and can fail after a number of batches"""
+
+    embedded: list = []
+    fail_after: int | None = None
+
+    def embed_documents(self, texts):
+        if self.fail_after is not None and len(self.embedded) >= self.fail_after:
+            raise RuntimeError("embedding backend went away")
+        self.embedded.append(list(texts))
+        return super().embed_documents(texts)
+
+
+def make_rows(n, status="Approved"):
+    return {str(i): {"application_id": str(i), "application_status": status, "rules": ""} for i in range(n)}
+
+
+def embedded_texts(embedding):
+    return [text for batch in embedding.embedded for text in batch]
+
+
+def assert_vectors_match(index, embedding, rows):
+    """Every live slot holds the (normalised) embedding of its own row"""
+    for app_id, (slot, _) in index.meta["rows"].items():
+        expected = np.asarray(embedding.embed_query(row_text(rows[app_id])), dtype=np.float32)
+        np.testing.assert_allclose(index.vectors[slot], expected / np.linalg.norm(expected), rtol=1e-5)
+
+
+def test_sync_counts_and_skips_unchanged_rows(tmp_path):
+    embedding = CountingEmbedding(size=8, embedded=[])
+    index = ApplicationEmbeddingIndex(str(tmp_path), embedding, batch_size=4)
+    rows = make_rows(10)
+
+    assert index.sync(rows) == {"inserted": 10, "updated": 0, "deleted": 0, "unchanged": 0}
+    assert len(embedded_texts(embedding)) == 10
+
+    embedding.embedded.clear()
+    rows["3"] = {**rows["3"], "application_status": "Declined"}
+    del rows["9"]
+    rows["10"] = make_rows(11)["10"]
+    assert index.sync(rows) == {"inserted": 1, "updated": 1, "deleted": 1, "unchanged": 8}
+    assert sorted(embedded_texts(embedding)) == sorted([row_text(rows["3"]), row_text(rows["10"])])
+
+    embedding.embedded.clear()
+    reopened = ApplicationEmbeddingIndex(str(tmp_path), embedding)
+    assert reopened.sync(rows)["unchanged"] == 10
+    assert embedding.embedded == []
+    assert_vectors_match(reopened, embedding, rows)
+
+
+def test_compact_keeps_the_right_vectors_after_reopen(tmp_path):
+    embedding = CountingEmbedding(size=8, embedded=[])
+    rows = make_rows(20)
+    ApplicationEmbeddingIndex(str(tmp_path), embedding, compact_ratio=0.25).sync(rows)
+
+    for app_id in ("0", "5", "6", "7", "12", "19"):  # 30% dead slots, over compact_ratio
+        del rows[app_id]
+    rows["2"] = {**rows["2"], "rules": "income too low"}
+    index = ApplicationEmbeddingIndex(str(tmp_path), embedding, compact_ratio=0.25)
+    index.sync(rows)
+    assert index.meta["n_slots"] == len(rows)
+    assert os.path.getsize(tmp_path / "vectors.f32") == len(rows) * 8 * 4
+
+    reopened = ApplicationEmbeddingIndex(str(tmp_path), embedding)
+    reopened.sync(rows)
+    assert_vectors_match(reopened, embedding, rows)
+    hit = reopened.similarity_search(row_text(rows["2"]), k=1)[0]
+    assert hit.metadata["application_id"] == "2"
+
+
+def test_resume_after_interrupted_batch(tmp_path):
+    rows = make_rows(10)
+    failing = CountingEmbedding(size=8, embedded=[], fail_after=2)
+    with pytest.raises(RuntimeError):
+        ApplicationEmbeddingIndex(str(tmp_path), failing, batch_size=3).sync(rows)
+    assert len(json.loads((tmp_path / "meta.json").read_text())["rows"]) == 6
+
+    embedding = CountingEmbedding(size=8, embedded=[])
+    index = ApplicationEmbeddingIndex(str(tmp_path), embedding, batch_size=3)
+    assert index.sync(rows) == {"inserted": 4, "updated": 0, "deleted": 0, "unchanged": 6}
+    assert len(embedded_texts(embedding)) == 4
+    assert_vectors_match(index, embedding, rows)
+
+
+def test_other_embedding_model_rebuilds_the_index(tmp_path):
+    rows = make_rows(5)
+    ApplicationEmbeddingIndex(str(tmp_path), CountingEmbedding(size=8, embedded=[])).sync(rows)
+
+    embedding = CountingEmbedding(size=16, embedded=[])
+    index = ApplicationEmbeddingIndex(str(tmp_path), embedding)
+    assert index.sync(rows) == {"inserted": 5, "updated": 0, "deleted": 0, "unchanged": 0}
+    assert index.meta["dim"] == 16
+    assert os.path.getsize(tmp_path / "vectors.f32") == 5 * 16 * 4
+    assert_vectors_match(index, embedding, rows)
+
+
+def test_dimension_mismatch_is_rejected(tmp_path):
+    rows = make_rows(3)
+    ApplicationEmbeddingIndex(str(tmp_path), CountingEmbedding(size=8, embedded=[])).sync(rows)
+
+    index = ApplicationEmbeddingIndex(str(tmp_path), CountingEmbedding(size=16, embedded=[]),
+                                      embedding_id="CountingEmbedding:8")  # same identity, other size
+    with pytest.raises(ValueError):
+        index.sync({**rows, "3": make_rows(4)["3"]})
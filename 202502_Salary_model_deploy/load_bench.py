@@ -0,0 +1,99 @@
+"""Load test for serve.py: throughput and p50/p99 latency at different batch settings."""
+
+import argparse
+import json
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from serve import SalaryPredictor, make_server
+
+DATA_PATH = Path(__file__).parent / "data" / "prediction_data.csv"
+
+
+def post(url: str, payload) -> dict:
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(),
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def run_load(url: str, rows: list[dict], n_requests: int, concurrency: int) -> dict:
+    """Fire n_requests single-row requests from `concurrency` client threads"""
+    latencies = []
+    lock = threading.Lock()
+    counter = iter(range(n_requests))
+
+    def worker():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            start = time.perf_counter()
+            post(f"{url}/predict", rows[i % len(rows)])
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000
+    return {
+        "throughput_rps": n_requests / wall,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--bulk-size", type=int, default=1000)
+    parser.add_argument("--settings", default="1:0,8:2,32:5,128:10",
+                        help="comma separated max_batch_size:max_wait_ms pairs")
+    args = parser.parse_args()
+
+    rows = pd.read_csv(DATA_PATH).to_dict(orient="records")
+    predictor = SalaryPredictor()  # load artifacts once, shared by every server below
+    results = []
+
+    for setting in args.settings.split(","):
+        max_batch_size, max_wait_ms = setting.split(":")
+        server = make_server(port=0, max_batch_size=int(max_batch_size),
+                             max_wait_ms=float(max_wait_ms), predictor=predictor)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}"
+
+        post(f"{url}/predict", rows[0])  # warm up
+        stats = run_load(url, rows, args.requests, args.concurrency)
+
+        bulk = (rows * (args.bulk_size // len(rows) + 1))[:args.bulk_size]
+        start = time.perf_counter()
+        post(f"{url}/predict/bulk", {"rows": bulk})
+        stats["bulk_rows_per_s"] = args.bulk_size / (time.perf_counter() - start)
+
+        with urllib.request.urlopen(f"{url}/health") as response:
+            stats["avg_batch_size"] = json.loads(response.read())["avg_batch_size"]
+        server.shutdown()
+        server.server_close()
+
+        results.append({"max_batch_size": int(max_batch_size), "max_wait_ms": float(max_wait_ms), **stats})
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}\n")
+    print(pd.DataFrame(results).round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
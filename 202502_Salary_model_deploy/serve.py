@@ -0,0 +1,163 @@
+"""Local prediction service for the saved salary pipeline, with request micro-batching."""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+MODEL_DIR = Path(__file__).parent / "models"
+
+
+class SalaryPredictor:
+    """Loads prep_pipeline and best_model once and scores rows in bulk"""
+
+    def __init__(self, model_dir: Path = MODEL_DIR):
+        self.prep = joblib.load(model_dir / "prep_pipeline.joblib")
+        self.model = joblib.load(model_dir / "model.joblib")
+        self.columns = list(self.prep.feature_names_in_)
+
+    def predict(self, rows: list[dict]) -> list[float]:
+        X = pd.DataFrame.from_records(rows, columns=self.columns)
+        # the model is trained on log(salary_in_usd)
+        return np.exp(self.model.predict(self.prep.transform(X))).tolist()
+
+
+class MicroBatcher:
+    """Coalesces concurrent requests into one vectorized predict call.
+
+    A batch is flushed once it holds max_batch_size rows or max_wait_ms has passed
+    since its first request arrived, whichever comes first.
+    """
+
+    def __init__(self, predict_fn, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, rows: list[dict]) -> Future:
+        future = Future()
+        self._queue.put((rows, future))
+        return future
+
+    def _collect(self) -> list[tuple[list[dict], Future]]:
+        items = [self._queue.get()]
+        size = len(items[0][0])
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            items.append(item)
+            size += len(item[0])
+        return items
+
+    def _predict(self, items: list[tuple[list[dict], Future]]):
+        rows = [row for request_rows, _ in items for row in request_rows]
+        try:
+            preds = self.predict_fn(rows)
+        except Exception as e:
+            if len(items) == 1:
+                items[0][1].set_exception(e)
+            else:
+                # one bad request must not fail the others it was coalesced with
+                for item in items:
+                    self._predict([item])
+            return
+
+        self.batches += 1
+        self.rows += len(rows)
+        start = 0
+        for request_rows, future in items:
+            future.set_result(preds[start:start + len(request_rows)])
+            start += len(request_rows)
+
+    def _run(self):
+        while True:
+            self._predict(self._collect())
+
+
+class PredictionServer(ThreadingHTTPServer):
+    request_queue_size = 256
+
+
+def make_handler(batcher: MicroBatcher):
+    """Build a request handler bound to a batcher"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, payload: dict):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path != "/health":
+                return self._send(404, {"error": "not found"})
+            avg = batcher.rows / batcher.batches if batcher.batches else 0.0
+            self._send(200, {"status": "ok", "batches": batcher.batches, "rows": batcher.rows, "avg_batch_size": avg})
+
+        def do_POST(self):
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                if self.path == "/predict":
+                    if not isinstance(payload, dict):
+                        raise ValueError("expected a JSON object with one row; use /predict/bulk for lists")
+                    preds = batcher.submit([payload]).result()
+                    self._send(200, {"salary_in_usd": preds[0]})
+                elif self.path == "/predict/bulk":
+                    rows = payload["rows"] if isinstance(payload, dict) else payload
+                    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+                        raise ValueError("expected a JSON list of row objects (or {\"rows\": [...]})")
+                    self._send(200, {"salary_in_usd": batcher.submit(rows).result()})
+                else:
+                    self._send(404, {"error": "not found"})
+            except Exception as e:
+                self._send(400, {"error": str(e)})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8000, max_batch_size: int = 64,
+                max_wait_ms: float = 5.0, predictor: SalaryPredictor = None) -> PredictionServer:
+    """Create (but don't start) a server; port=0 picks a free port"""
+    predictor = predictor or SalaryPredictor()
+    batcher = MicroBatcher(predictor.predict, max_batch_size, max_wait_ms)
+    return PredictionServer((host, port), make_handler(batcher))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.max_batch_size, args.max_wait_ms)
+    print(f"Serving on http://{args.host}:{server.server_port} "
+          f"(max_batch_size={args.max_batch_size}, max_wait_ms={args.max_wait_ms})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
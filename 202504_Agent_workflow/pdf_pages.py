@@ -0,0 +1,90 @@
+"""Page-level PDF helpers. Kept in a module so a process pool can pickle them from the notebook."""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pdfplumber
+
+PRODUCTS = [
+    ("Chicken breast", "Meat"), ("Minced beef", "Meat"), ("Salmon fillet", "Fish"),
+    ("Cod loins", "Fish"), ("Whole milk", "Dairy"), ("Greek yoghurt", "Dairy"),
+    ("Cheddar cheese", "Dairy"), ("Free-range eggs", "Dairy"), ("Broccoli", "Vegetables"),
+    ("Cherry tomatoes", "Vegetables"), ("Baby spinach", "Vegetables"), ("Sweet potatoes", "Vegetables"),
+    ("Bananas", "Fruit"), ("Blueberries", "Fruit"), ("Avocados", "Fruit"), ("Lemons", "Fruit"),
+    ("Basmati rice", "Pantry"), ("Whole wheat pasta", "Pantry"), ("Chickpeas", "Pantry"),
+    ("Olive oil", "Pantry"), ("Sourdough bread", "Bakery"), ("Oat cookies", "Bakery"),
+    ("Orange juice", "Drinks"), ("Sparkling water", "Drinks"),
+]
+
+
+def page_count(pdf_path: str) -> int:
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_page(pdf_path: str, page_no: int) -> str:
+    """Extract the text of a single page (0-based)"""
+    with pdfplumber.open(pdf_path) as pdf:
+        return pdf.pages[page_no].extract_text() or ""
+
+
+def _extract_range(pdf_path: str, page_nos: list[int]) -> list[str]:
+    with pdfplumber.open(pdf_path) as pdf:
+        return [pdf.pages[i].extract_text() or "" for i in page_nos]
+
+
+def extract_pages(pdf_path: str, page_nos: list[int], max_workers: int = None) -> list[str]:
+    """Extract pages in a process pool, each worker opening the PDF once for a contiguous chunk"""
+    page_nos = list(page_nos)
+    if not page_nos:
+        return []
+    max_workers = min(max_workers or os.cpu_count() or 1, len(page_nos))
+    size = -(-len(page_nos) // max_workers)
+    chunks = [page_nos[i:i + size] for i in range(0, len(page_nos), size)]
+    with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+        results = pool.map(_extract_range, [pdf_path] * len(chunks), chunks)
+        return [text for chunk in results for text in chunk]
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_synthetic_flyer(path: str, n_pages: int = 8, items_per_page: int = 12, seed: int = 0) -> str:
+    """Write a plain-text multi-page grocery flyer PDF for benchmarking"""
+    rng = random.Random(seed)
+    pages = []
+    for page in range(n_pages):
+        lines = [f"WEEKLY GROCERY DEALS - page {page + 1} of {n_pages}", ""]
+        for product, category in rng.sample(PRODUCTS, min(items_per_page, len(PRODUCTS))):
+            lines.append(f"{product} ({category}) - {rng.choice([10, 20, 25, 30, 40])}% off, "
+                         f"now {rng.uniform(9, 129):.2f} SEK")
+        pages.append(lines)
+
+    # objects: 1 catalog, 2 page tree, 3 font, then a page + content stream pair per page
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        ("<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            " ".join(f"{4 + 2 * i} 0 R" for i in range(n_pages)), n_pages)).encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, lines in enumerate(pages):
+        stream = "BT /F1 12 Tf 16 TL 50 780 Td " + " ".join(f"({_escape(l)}) Tj T*" for l in lines) + " ET"
+        objects.append((f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                        f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>").encode())
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream".encode())
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+
+    with open(path, "wb") as f:
+        f.write(out)
+    return path
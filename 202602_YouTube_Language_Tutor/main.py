@@ -6,10 +6,12 @@ import sys
 import re
 from datetime import datetime
 from pathlib import Path
-from transcript import get_available_languages, fetch_transcript, chunk_if_needed
-from tutor import summarise_transcript, generate_questions_and_vocabulary, generate_answers, summarise_chat, ChatSession
+from transcript import extract_video_id, get_available_languages, fetch_snippets, chunk_if_needed
+from tutor import summarise_transcript, generate_questions_and_vocabulary, generate_answers, summarise_chat, ChatSession, embed_texts
+from retrieval import TranscriptIndex, load_index, timestamp
 
 SUMMARISE_THRESHOLD = 3_000
+USE_EMBEDDINGS = os.environ.get("TUTOR_EMBEDDINGS") == "1"  # BM25 only by default
 
 
 def prompt(text: str) -> str:
@@ -47,9 +49,15 @@ def pick_language(url: str) -> str:
             pass
 
 
-def get_transcript(url: str, lang_code: str) -> str:
+def get_transcript(url: str, lang_code: str) -> tuple[str, TranscriptIndex]:
     print("\n  → Fetching transcript...")
-    text, words, original = chunk_if_needed(fetch_transcript(url, lang_code))
+    index = load_index(
+        extract_video_id(url), lang_code,
+        lambda: fetch_snippets(url, lang_code),
+        embed=embed_texts if USE_EMBEDDINGS else None,
+    )
+    print(f"  ✓ Indexed {len(index.windows)} timestamped sections")
+    text, words, original = chunk_if_needed(index.text())
     
     if words < original:
         print(f"  ⚠ Long video ({original} words) — using first {words} words")
@@ -61,7 +69,7 @@ def get_transcript(url: str, lang_code: str) -> str:
         text = summarise_transcript(text)
         print(f"  ✓ Condensed to ~{len(text.split())} words")
     
-    return text
+    return text, index
 
 
 def chat_loop(session: ChatSession, lang: str):
@@ -76,7 +84,9 @@ def chat_loop(session: ChatSession, lang: str):
             print("\nGreat work today!")
             break
         print(f"  → {msg}")
-        print(f"\nTutor: {session.send(msg)}\n")
+        reply = session.send(msg)
+        sources = " ".join(timestamp(w["start"]) for w in session.last_sources)
+        print(f"\nTutor: {reply}\n" + (f"  ⏱ {sources}\n" if sources else ""))
 
 
 def main():
@@ -102,13 +112,13 @@ def main():
         divider("CAPTIONS")
         lang_code = pick_language(url)
         divider("TRANSCRIPT")
-        transcript = get_transcript(url, lang_code)
+        transcript, index = get_transcript(url, lang_code)
         
         # Generate materials
         print("\n  → Generating questions & vocabulary...")
         questions, vocab = generate_questions_and_vocabulary(transcript, lang)
         print("  → Preparing answers...")
-        answers = generate_answers(questions, lang, transcript)
+        answers = generate_answers(questions, lang, transcript, index)
         
         # Display
         divider("QUESTIONS")
@@ -123,7 +133,7 @@ def main():
         # Chat
         input("\n  Press Enter to start chat...")
         divider("CHAT")
-        session = ChatSession(transcript, lang)
+        session = ChatSession(transcript, lang, index)
         chat_loop(session, lang)
         
         # Save
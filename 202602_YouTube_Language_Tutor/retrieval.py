@@ -0,0 +1,145 @@
+"""Transcript retrieval - BM25 (plus optional embeddings) over timestamped caption windows, cached per video."""
+
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Callable
+
+CACHE_DIR = Path(".transcript_cache")
+WINDOW_SECONDS = 30.0
+K1, B = 1.5, 0.75   # BM25 parameters
+RRF_K = 60          # reciprocal rank fusion constant for BM25 + embedding ranks
+
+# scripts written without spaces are indexed as character bigrams
+_NO_SPACE_SCRIPT = re.compile(r"[぀-ヿ㐀-䶿一-鿿가-힯฀-๿]")
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = []
+    for word in re.findall(r"\w+", text.lower()):
+        if _NO_SPACE_SCRIPT.search(word) and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def timestamp(seconds: float) -> str:
+    """[mm:ss], or [h:mm:ss] past the hour"""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"[{hours}:{minutes:02d}:{secs:02d}]" if hours else f"[{minutes:02d}:{secs:02d}]"
+
+
+def make_windows(snippets: list[dict], window_seconds: float = WINDOW_SECONDS) -> list[dict]:
+    """Group consecutive caption snippets into windows of about window_seconds"""
+    windows, current = [], []
+    for snippet in snippets:
+        current.append(snippet)
+        if snippet["start"] + snippet["duration"] - current[0]["start"] >= window_seconds:
+            windows.append(current)
+            current = []
+    if current:
+        windows.append(current)
+    return [
+        {"start": w[0]["start"], "end": w[-1]["start"] + w[-1]["duration"], "text": " ".join(s["text"] for s in w)}
+        for w in windows
+    ]
+
+
+def format_windows(windows: list[dict]) -> str:
+    return "\n".join(f"{timestamp(w['start'])} {w['text']}" for w in windows)
+
+
+class TranscriptIndex:
+    """BM25 over transcript windows; with `embed` (texts -> vectors) ranks are fused with embedding similarity"""
+
+    def __init__(self, windows: list[dict], embeddings: list[list[float]] = None, embed: Callable = None):
+        self.windows = windows
+        self.embeddings = embeddings
+        self.embed = embed
+        self._tf = [Counter(tokenize(w["text"])) for w in windows]
+        self._len = [sum(tf.values()) for tf in self._tf]
+        self._avg_len = sum(self._len) / len(windows) if windows else 0.0
+        df = Counter(term for tf in self._tf for term in tf)
+        self._idf = {term: math.log(1 + (len(windows) - n + 0.5) / (n + 0.5)) for term, n in df.items()}
+
+    @classmethod
+    def build(cls, windows: list[dict], embed: Callable = None) -> "TranscriptIndex":
+        embeddings = embed([w["text"] for w in windows]) if embed and windows else None
+        return cls(windows, embeddings, embed)
+
+    def text(self) -> str:
+        """The full transcript text"""
+        return " ".join(w["text"] for w in self.windows)
+
+    def _bm25(self, terms: list[str]) -> list[float]:
+        scores = []
+        for tf, length in zip(self._tf, self._len):
+            score = 0.0
+            for term in terms:
+                if term in tf:
+                    f = tf[term]
+                    score += self._idf[term] * f * (K1 + 1) / (f + K1 * (1 - B + B * length / self._avg_len))
+            scores.append(score)
+        return scores
+
+    def _rank(self, query: str, k: int) -> list[tuple[int, float]]:
+        """(index, score) of the k most relevant windows, best first"""
+        scores = self._bm25(tokenize(query))
+        ranked = sorted(range(len(self.windows)), key=lambda i: -scores[i])
+
+        if self.embeddings and self.embed:
+            q = self.embed([query])[0]
+            q_norm = math.sqrt(sum(x * x for x in q)) or 1.0
+            sims = [sum(a * b for a, b in zip(q, v)) / ((math.sqrt(sum(x * x for x in v)) or 1.0) * q_norm)
+                    for v in self.embeddings]
+            dense = sorted(range(len(self.windows)), key=lambda i: -sims[i])
+            fused = Counter()
+            for ranking in (ranked, dense):
+                for rank, i in enumerate(ranking):
+                    fused[i] += 1 / (RRF_K + rank + 1)
+            return fused.most_common(k)
+        return [(i, scores[i]) for i in ranked[:k] if scores[i] > 0]
+
+    def search(self, query: str, k: int = 4) -> list[dict]:
+        """The k most relevant windows, in video order"""
+        return [self.windows[i] for i, _ in sorted(self._rank(query, k))]
+
+    def search_many(self, queries: list[str], k_each: int = 2, limit: int = 6) -> list[dict]:
+        """Union of the top windows for several queries (e.g. one per question), in video order.
+
+        Windows are taken round-robin by rank (every query's best window, then every second best, ...),
+        higher scores first within a round, so the cut at `limit` depends on relevance and not on where
+        in the video a window is. Every query keeps its best window, even past `limit`.
+        """
+        rankings = [self._rank(query, k_each) for query in queries]
+        picked = []
+        for rank in range(k_each):
+            tier = sorted((r[rank] for r in rankings if rank < len(r)), key=lambda hit: -hit[1])
+            picked += [i for i, _ in tier if i not in picked]
+        best = {r[0][0] for r in rankings if r}
+        return [self.windows[i] for i in sorted(best | set(picked[:limit]))]
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"windows": self.windows, "embeddings": self.embeddings}), encoding="utf-8")
+        tmp.replace(path)
+
+
+def load_index(video_id: str, language_code: str, fetch_snippets: Callable[[], list[dict]],
+               embed: Callable = None, cache_dir: Path = CACHE_DIR) -> TranscriptIndex:
+    """Index for a video, built once (captions fetched, optionally embedded) and then loaded from cache"""
+    path = Path(cache_dir) / f"{video_id}_{language_code}.json"
+    if path.exists():
+        cached = json.loads(path.read_text(encoding="utf-8"))
+        if cached["embeddings"] or not embed:
+            return TranscriptIndex(cached["windows"], cached["embeddings"], embed)
+        index = TranscriptIndex.build(cached["windows"], embed)  # cached without embeddings: only embed
+    else:
+        index = TranscriptIndex.build(make_windows(fetch_snippets()), embed)
+    index.save(path)
+    return index
@@ -23,11 +23,16 @@ def get_available_languages(url: str) -> list[tuple[str, str]]:
     return [(t.language_code, t.language) for t in transcript_list]
 
 
-def fetch_transcript(url: str, language_code: str) -> str:
-    """Fetch and return raw transcript text."""
+def fetch_snippets(url: str, language_code: str) -> list[dict]:
+    """Fetch timestamped captions as [{text, start, duration}, ...]."""
     video_id = extract_video_id(url)
     fetched = YouTubeTranscriptApi().fetch(video_id, languages=[language_code])
-    return " ".join(snippet.text for snippet in fetched)
+    return [{"text": s.text, "start": s.start, "duration": s.duration} for s in fetched]
+
+
+def fetch_transcript(url: str, language_code: str) -> str:
+    """Fetch and return raw transcript text."""
+    return " ".join(snippet["text"] for snippet in fetch_snippets(url, language_code))
 
 
 def chunk_if_needed(text: str) -> tuple[str, int, int]:
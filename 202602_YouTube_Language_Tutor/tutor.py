@@ -3,8 +3,13 @@
 import os
 from google import genai
 from google.genai import types
+from retrieval import TranscriptIndex, format_windows
 
-client = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
+client = genai.Client(
+    api_key=os.environ["GEMINI_API_KEY"],
+    # optional, e.g. a local stand-in server for offline benchmarks
+    http_options=types.HttpOptions(base_url=os.environ["GEMINI_BASE_URL"]) if os.environ.get("GEMINI_BASE_URL") else None,
+)
 
 
 def _get_model() -> str:
@@ -23,6 +28,7 @@ def _get_model() -> str:
 
 MODEL = _get_model()
 print(f" Using {MODEL}")
+EMBEDDING_MODEL = "gemini-embedding-001"
 
 
 def _call(system: str, user: str) -> str:
@@ -61,11 +67,28 @@ def generate_questions_and_vocabulary(transcript: str, lang: str) -> tuple[str,
     return text, ""
 
 
-def generate_answers(questions: str, lang: str, transcript: str) -> str:
-    excerpt = transcript[:1500].rsplit(" ", 1)[0]
+def embed_texts(texts: list[str]) -> list[list[float]]:
+    """Embed texts in batches (for the optional embedding half of transcript retrieval)."""
+    vectors = []
+    for i in range(0, len(texts), 100):
+        response = client.models.embed_content(model=EMBEDDING_MODEL, contents=texts[i:i + 100])
+        vectors.extend(e.values for e in response.embeddings)
+    return vectors
+
+
+def generate_answers(questions: str, lang: str, transcript: str, index: TranscriptIndex = None) -> str:
+    if index is None:
+        excerpt = transcript[:1500].rsplit(" ", 1)[0]
+        return _call(
+            f"Transcript:\n{excerpt}",
+            f"Questions:\n{questions}\n\nWrite answers in {lang} only. Number to match. Be concise."
+        )
+    # retrieve per question/hint line, so each answer sees the part of the video it is about
+    excerpts = index.search_many([line for line in questions.splitlines() if line.strip()])
     return _call(
-        f"Transcript:\n{excerpt}",
-        f"Questions:\n{questions}\n\nWrite answers in {lang} only. Number to match. Be concise."
+        f"Transcript excerpts ([mm:ss] = position in the video):\n{format_windows(excerpts)}",
+        f"Questions:\n{questions}\n\nWrite answers in {lang} only. Number to match. Be concise. "
+        f"End each answer with the [mm:ss] timestamp(s) it is based on."
     )
 
 
@@ -78,24 +101,43 @@ def summarise_chat(lang: str, exchanges: list[tuple[str, str]]) -> str:
 
 
 class ChatSession:
-    """Stateful chat with history."""
+    """Stateful chat with history. With an index, each turn gets only the relevant transcript windows."""
     
-    def __init__(self, transcript: str, lang: str):
+    def __init__(self, transcript: str, lang: str, index: TranscriptIndex = None):
         self._system = (
             f"You are a {lang} tutor. Answer questions about video, vocabulary, grammar. "
-            f"Reply in the same language the student uses.\n\nTranscript:\n{transcript}"
+            f"Reply in the same language the student uses."
         )
+        if index is None:
+            self._system += f"\n\nTranscript:\n{transcript}"
+        else:
+            self._system += (
+                " Messages come with the transcript excerpts most relevant to them, each marked [mm:ss]. "
+                "Cite those timestamps when your reply draws on them."
+            )
+        self._index = index
         self._history = []
         self.exchanges = []
+        self.last_sources = []
     
     def send(self, msg: str) -> str:
-        self._history.append(types.Content(role="user", parts=[types.Part.from_text(text=msg)]))
+        content = msg
+        self.last_sources = []
+        if self._index is not None:
+            # the previous question helps with follow-ups like "and what about the second part?"
+            query = f"{self.exchanges[-1][0]} {msg}" if self.exchanges else msg
+            self.last_sources = self._index.search(query)
+            if self.last_sources:
+                content = f"Transcript excerpts:\n{format_windows(self.last_sources)}\n\nStudent: {msg}"
+        
+        # excerpts go with the current turn only; history keeps the plain messages
+        user = types.Content(role="user", parts=[types.Part.from_text(text=msg)])
         response = client.models.generate_content(
             model=MODEL,
-            contents=self._history,
+            contents=self._history + [types.Content(role="user", parts=[types.Part.from_text(text=content)])],
             config=types.GenerateContentConfig(system_instruction=self._system),
         )
         reply = response.text
-        self._history.append(types.Content(role="model", parts=[types.Part.from_text(text=reply)]))
+        self._history += [user, types.Content(role="model", parts=[types.Part.from_text(text=reply)])]
         self.exchanges.append((msg, reply))
         return reply
@@ -0,0 +1,326 @@
+"""Local stand-ins for the external services the projects call: Ollama, OpenAI (also NVIDIA NIM), Gemini
+and YouTube captions. One HTTP server speaks all four wire formats with a configurable latency profile."""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+EMBEDDING_DIM = 64
+OPENAI_MODELS = ["gpt-3.5-turbo-0125", "deepseek-ai/deepseek-r1", "text-embedding-ada-002"]  # listed by /v1/models
+WORDS = ("the loan offer weekly deals salmon fresh price model feature data video language learn "
+         "speak travel market city summer music coffee friend question answer good new").split()
+
+
+@dataclass
+class Profile:
+    """Latency of a stand-in service: time to first token, generation speed and per-text embedding cost"""
+    ttft_ms: float
+    tokens_per_s: float
+    embed_ms: float
+    jitter: float = 0.1  # relative, uniform +/- applied to every delay
+
+    def delay(self, seconds: float) -> float:
+        return max(0.0, seconds * (1 + random.uniform(-self.jitter, self.jitter)))
+
+
+PROFILES = {
+    "instant": Profile(ttft_ms=0, tokens_per_s=float("inf"), embed_ms=0, jitter=0),
+    "fast": Profile(ttft_ms=20, tokens_per_s=1000, embed_ms=0.5),
+    "local": Profile(ttft_ms=300, tokens_per_s=40, embed_ms=15),   # e.g. a 7-14B model through Ollama on a laptop
+    "cloud": Profile(ttft_ms=500, tokens_per_s=120, embed_ms=5),   # hosted API over the internet
+}
+
+
+def tokenize(text: str) -> list[str]:
+    """Split into word-ish tokens that concatenate back to the original text"""
+    return re.findall(r"\s*\S+|\s+", text) or [""]
+
+
+def lorem(n_words: int, seed: str = "") -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def fake_embedding(text: str) -> list[float]:
+    """Deterministic unit vector derived from the text"""
+    digest = hashlib.sha256(text.encode()).digest()
+    rng = random.Random(digest)
+    vec = [rng.gauss(0, 1) for _ in range(EMBEDDING_DIM)]
+    norm = sum(v * v for v in vec) ** 0.5
+    return [v / norm for v in vec]
+
+
+def default_responder(api: str, prompt: str) -> str:
+    return lorem(64, prompt)
+
+
+class FakeServices(ThreadingHTTPServer):
+    """Ollama, OpenAI-compatible, Gemini and YouTube caption endpoints on one local port.
+
+    `responder(api, prompt) -> str` decides what the models answer, so each benchmark scenario can
+    return text its pipeline parses (JSON, code blocks, ...). `stats` counts requests, generated
+    tokens and streams the client closed early, per API.
+    """
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, profile: Profile = PROFILES["fast"], host: str = "127.0.0.1", port: int = 0,
+                 caption_snippets: int = 600):
+        super().__init__((host, port), _Handler)
+        self.profile = profile
+        self.responder = default_responder
+        self.caption_snippets = caption_snippets
+        self.stats: dict[str, Counter] = defaultdict(Counter)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.server_address[0]}:{self.server_port}"
+
+    def count(self, api: str, **values):
+        with self._lock:
+            self.stats[api].update(values)
+
+    def start(self) -> "FakeServices":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeServices
+
+    def log_message(self, format, *args):
+        pass
+
+    # --- plumbing
+
+    def _json_body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send(self, payload, status: int = 200, content_type: str = "application/json"):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _generate(self, api: str, prompt: str) -> str:
+        """Answer and sleep for the whole generation (non-streaming requests)"""
+        text = self.server.responder(api, prompt)
+        n_tokens = len(tokenize(text))
+        profile = self.server.profile
+        time.sleep(profile.delay(profile.ttft_ms / 1000 + n_tokens / profile.tokens_per_s))
+        self.server.count(api, requests=1, tokens=n_tokens)
+        return text
+
+    def _stream(self, api: str, prompt: str, chunk, done, sse: bool = False, max_tokens: int = None):
+        """Stream one token per chunk at the profile's rate; stops if the client hangs up
+        or after max_tokens (the request's generation cap, e.g. Ollama's num_predict)"""
+        profile = self.server.profile
+        tokens = tokenize(self.server.responder(api, prompt))
+        tokens = tokens[:max_tokens] if max_tokens and max_tokens > 0 else tokens  # -1 = no cap
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream" if sse else "application/x-ndjson")
+        self.end_headers()
+        time.sleep(profile.delay(profile.ttft_ms / 1000))
+        sent = 0
+        try:
+            for token in tokens:
+                time.sleep(profile.delay(1 / profile.tokens_per_s))
+                self._write_event(chunk(token), sse)
+                sent += 1
+            self._write_event(done(sent), sse)
+            if sse:
+                self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.server.count(api, cancelled=1)
+        finally:
+            self.server.count(api, requests=1, tokens=sent)
+            self.close_connection = True
+
+    def _write_event(self, payload: dict, sse: bool):
+        line = json.dumps(payload).encode()
+        self.wfile.write(b"data: " + line + b"\n\n" if sse else line + b"\n")
+        self.wfile.flush()
+
+    def _embed(self, api: str, texts: list[str]) -> list[list[float]]:
+        profile = self.server.profile
+        time.sleep(profile.delay(profile.embed_ms * len(texts) / 1000))
+        self.server.count(api, requests=1, embedded=len(texts))
+        return [fake_embedding(text) for text in texts]
+
+    # --- routing
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path in ("/api/tags", "/api/ps"):
+            return self._send({"models": []})
+        if url.path == "/api/version":
+            return self._send({"version": "0.0.0-fake"})
+        if url.path == "/v1/models":
+            return self._send({"object": "list", "data": [{"id": model, "object": "model"} for model in OPENAI_MODELS]})
+        if url.path == "/v1beta/models":
+            return self._send({"models": [{"name": "models/gemini-2.0-flash", "supportedActions": ["generateContent"],
+                                           "supportedGenerationMethods": ["generateContent"]}]})
+        if url.path == "/watch":
+            return self._youtube_watch(query["v"][0])
+        if url.path == "/api/timedtext":
+            return self._youtube_timedtext(query["v"][0], query.get("lang", ["en"])[0])
+        self._send({"error": f"not found: {url.path}"}, 404)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        body = self._json_body()
+        if url.path == "/api/chat":
+            return self._ollama_chat(body)
+        if url.path == "/api/generate":
+            return self._ollama_generate(body)
+        if url.path in ("/api/embed", "/api/embeddings"):
+            return self._ollama_embed(url.path, body)
+        if url.path == "/v1/chat/completions":
+            return self._openai_chat(body)
+        if url.path == "/v1/embeddings":
+            return self._openai_embeddings(body)
+        if url.path.startswith("/v1beta/models/") and url.path.endswith(":generateContent"):
+            return self._gemini_generate(body)
+        if url.path.startswith("/v1beta/models/") and url.path.endswith(":batchEmbedContents"):
+            return self._gemini_embed(body)
+        if url.path == "/youtubei/v1/player":
+            return self._youtube_player(body)
+        self._send({"error": f"not found: {url.path}"}, 404)
+
+    # --- Ollama
+
+    def _ollama_chat(self, body: dict):
+        model = body.get("model", "")
+        prompt = body["messages"][-1]["content"] if body.get("messages") else ""
+        base = {"model": model, "created_at": "2025-01-01T00:00:00Z"}
+        if body.get("stream", True):
+            return self._stream(
+                "ollama", prompt,
+                lambda token: {**base, "message": {"role": "assistant", "content": token}, "done": False},
+                lambda n: {**base, "message": {"role": "assistant", "content": ""}, "done": True,
+                           "done_reason": "stop", "eval_count": n},
+                max_tokens=(body.get("options") or {}).get("num_predict"))
+        text = self._generate("ollama", prompt)
+        self._send({**base, "message": {"role": "assistant", "content": text}, "done": True,
+                    "done_reason": "stop", "eval_count": len(tokenize(text))})
+
+    def _ollama_generate(self, body: dict):
+        model, prompt = body.get("model", ""), body.get("prompt", "")
+        base = {"model": model, "created_at": "2025-01-01T00:00:00Z"}
+        if not prompt:  # an empty prompt only loads the model
+            return self._send({**base, "response": "", "done": True, "done_reason": "load"})
+        if body.get("stream", True):
+            return self._stream(
+                "ollama", prompt,
+                lambda token: {**base, "response": token, "done": False},
+                lambda n: {**base, "response": "", "done": True, "done_reason": "stop", "eval_count": n})
+        text = self._generate("ollama", prompt)
+        self._send({**base, "response": text, "done": True, "done_reason": "stop", "eval_count": len(tokenize(text))})
+
+    def _ollama_embed(self, path: str, body: dict):
+        if path == "/api/embeddings":
+            return self._send({"embedding": self._embed("ollama", [body.get("prompt", "")])[0]})
+        texts = body.get("input", [])
+        texts = [texts] if isinstance(texts, str) else texts
+        self._send({"model": body.get("model", ""), "embeddings": self._embed("ollama", texts)})
+
+    # --- OpenAI-compatible (OpenAI, NVIDIA NIM)
+
+    def _openai_chat(self, body: dict):
+        model = body.get("model", "")
+        content = body["messages"][-1]["content"] if body.get("messages") else ""
+        prompt = content if isinstance(content, str) else " ".join(part.get("text", "") for part in content)
+        base = {"id": "chatcmpl-fake", "created": 0, "model": model}
+        if body.get("stream"):
+            return self._stream(
+                "openai", prompt,
+                lambda token: {**base, "object": "chat.completion.chunk",
+                               "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]},
+                lambda n: {**base, "object": "chat.completion.chunk",
+                           "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]},
+                sse=True)
+        text = self._generate("openai", prompt)
+        n_tokens = len(tokenize(text))
+        self._send({**base, "object": "chat.completion",
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": len(tokenize(prompt)), "completion_tokens": n_tokens,
+                              "total_tokens": len(tokenize(prompt)) + n_tokens}})
+
+    def _openai_embeddings(self, body: dict):
+        texts = body.get("input", [])
+        texts = [texts] if isinstance(texts, str) else texts
+        texts = [text if isinstance(text, str) else " ".join(map(str, text)) for text in texts]
+        self._send({"object": "list", "model": body.get("model", ""),
+                    "data": [{"object": "embedding", "index": i, "embedding": vec}
+                             for i, vec in enumerate(self._embed("openai", texts))],
+                    "usage": {"prompt_tokens": 0, "total_tokens": 0}})
+
+    # --- Gemini
+
+    def _gemini_generate(self, body: dict):
+        contents = body.get("contents", [])
+        parts = contents[-1].get("parts", []) if contents else []
+        # everything the model would have to read: system instruction plus the whole conversation
+        context = [body.get("systemInstruction") or body.get("system_instruction") or {}, *contents]
+        self.server.count("gemini", prompt_chars=sum(len(part.get("text", ""))
+                                                     for c in context for part in c.get("parts", [])))
+        text = self._generate("gemini", " ".join(part.get("text", "") for part in parts))
+        self._send({"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}],
+                    "usageMetadata": {"candidatesTokenCount": len(tokenize(text))}})
+
+    def _gemini_embed(self, body: dict):
+        texts = [" ".join(part.get("text", "") for part in r.get("content", {}).get("parts", []))
+                 for r in body.get("requests", [])]
+        self._send({"embeddings": [{"values": vec} for vec in self._embed("gemini", texts)]})
+
+    # --- YouTube captions (watch page -> innertube player -> timedtext XML)
+
+    def _youtube_watch(self, video_id: str):
+        self.server.count("captions", requests=1)
+        self._send(f'<html><script>var cfg = {{"INNERTUBE_API_KEY": "fake-key", "videoId": "{video_id}"}};'
+                   f'</script></html>'.encode(), content_type="text/html")
+
+    def _youtube_player(self, body: dict):
+        self.server.count("captions", requests=1)
+        video_id = body.get("videoId", "")
+        tracks = [{"baseUrl": f"{self.server.url}/api/timedtext?v={video_id}&lang={code}",
+                   "name": {"runs": [{"text": name}]}, "languageCode": code}
+                  for code, name in (("sv", "Swedish"), ("en", "English"))]
+        self._send({"playabilityStatus": {"status": "OK"},
+                    "captions": {"playerCaptionsTracklistRenderer": {"captionTracks": tracks}}})
+
+    def _youtube_timedtext(self, video_id: str, lang: str):
+        profile = self.server.profile
+        time.sleep(profile.delay(profile.ttft_ms / 1000))
+        self.server.count("captions", requests=1, snippets=self.server.caption_snippets)
+        rng = random.Random(f"{video_id}-{lang}")
+        lines = [f'<text start="{3.0 * i:.2f}" dur="3.00">{escape(lorem(rng.randint(5, 12), f"{video_id}{i}"))}.</text>'
+                 for i in range(self.server.caption_snippets)]
+        self._send(f'<?xml version="1.0" encoding="utf-8" ?><transcript>{"".join(lines)}</transcript>'.encode(),
+                   content_type="text/xml")
@@ -0,0 +1,86 @@
+"""Load the functions and classes defined in a project notebook or `#%%` script without running its
+sample code: only imports, definitions and assignments are executed."""
+
+import ast
+import json
+import sys
+import types
+from pathlib import Path
+
+KEPT_NODES = (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef,
+              ast.Assign, ast.AnnAssign)
+
+
+def read_source(path: Path, cells: list[int] = None) -> str:
+    """Source of a .py file, or the code cells of a notebook (optionally only `cells`) without magics"""
+    path = Path(path)
+    if path.suffix != ".ipynb":
+        return path.read_text(encoding="utf-8")
+    notebook = json.loads(path.read_text(encoding="utf-8"))
+    sources = [
+        "".join(cell["source"]) for i, cell in enumerate(notebook["cells"])
+        if cell["cell_type"] == "code" and (cells is None or i in cells)
+    ]
+    return "\n\n".join(
+        "\n".join(line for line in source.splitlines() if not line.lstrip().startswith(("%", "!")))
+        for source in sources
+    )
+
+
+def _assigned_names(node: ast.AST) -> set[str]:
+    targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+    return {name.id for target in targets for name in ast.walk(target) if isinstance(name, ast.Name)}
+
+
+def _imported_roots(node: ast.AST) -> set[str]:
+    if isinstance(node, ast.ImportFrom):
+        return {(node.module or "").split(".")[0]}
+    return {alias.name.split(".")[0] for alias in node.names}
+
+
+def _bound_name(alias: ast.alias) -> str:
+    return alias.asname or alias.name.split(".")[0]
+
+
+def load_definitions(path, namespace: dict = None, skip_names=(), skip_modules=(), cells: list[int] = None,
+                     strip_decorators: bool = False) -> dict:
+    """Execute the top-level imports, defs, classes and assignments of `path` into a namespace.
+
+    - namespace: pre-set globals; assignments and imports of these names are skipped so they act as overrides
+    - skip_names: assignments, imports and defs to skip (model loads, sample runs, API-key placeholders)
+    - skip_modules: top-level modules whose imports are dropped (heavy deps a scenario doesn't touch)
+    - strip_decorators: drop decorators such as st.cache_data so every call does the real work
+    """
+    path = Path(path).resolve()
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))  # project-local modules such as pdf_pages or application_lookup
+    skip_names = set(skip_names) | set(namespace or {})
+    # a registered module, so dataclasses and pickling can resolve the definitions' __module__
+    module = types.ModuleType(f"bench_{path.stem}")
+    module.__file__ = str(path)
+    module.__dict__.update(namespace or {})
+    sys.modules[module.__name__] = module
+
+    tree = ast.parse(read_source(path, cells), filename=str(path), type_comments=False)
+    body = []
+    for node in tree.body:
+        if not isinstance(node, KEPT_NODES):
+            continue
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            if _imported_roots(node) & set(skip_modules):
+                continue
+            node.names = [alias for alias in node.names if _bound_name(alias) not in skip_names]
+            if not node.names:
+                continue
+        if isinstance(node, (ast.Assign, ast.AnnAssign)) and _assigned_names(node) & skip_names:
+            continue
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) and node.name in skip_names:
+            continue
+        if strip_decorators and isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            node.decorator_list = []
+        body.append(node)
+
+    # __future__ imports must stay first
+    body.sort(key=lambda node: not (isinstance(node, ast.ImportFrom) and node.module == "__future__"))
+    exec(compile(ast.Module(body=body, type_ignores=[]), str(path), "exec"), module.__dict__)
+    return module.__dict__
@@ -0,0 +1,218 @@
+"""Offline end-to-end benchmarks: run the projects' pipeline code against local stand-in services,
+write stage-level latency, throughput and peak memory to JSON, and diff against an earlier baseline."""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import traceback
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, replace
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fake_servers import PROFILES, FakeServices
+
+HERE = Path(__file__).resolve().parent
+
+
+class Recorder:
+    """Collects wall time, items processed and peak traced Python memory per stage"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    @contextmanager
+    def stage(self, name: str, items: int = 1):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - start
+        self.samples[name].append((seconds, items, tracemalloc.get_traced_memory()[1] - base))
+
+    def summary(self) -> dict:
+        stages = {}
+        for name, samples in self.samples.items():
+            seconds = sorted(s for s, _, _ in samples)
+            stages[name] = {
+                "calls": len(samples),
+                "mean_s": round(sum(seconds) / len(seconds), 4),
+                "p50_s": round(seconds[len(seconds) // 2], 4),
+                "max_s": round(seconds[-1], 4),
+                "items_per_s": round(sum(i for _, i, _ in samples) / max(sum(seconds), 1e-9), 2),
+                "peak_mb": round(max(p for _, _, p in samples) / 2**20, 2),
+            }
+        return stages
+
+
+def run_scenario(name: str, profile, repeat: int) -> dict:
+    """Run one scenario in this process (called in a fresh worker process per scenario)"""
+    services = FakeServices(profile).start()
+    # every client library picks its endpoint up from the environment (or from overrides in scenarios.py)
+    os.environ.update({
+        "OLLAMA_HOST": services.url,
+        "GEMINI_API_KEY": "fake", "GEMINI_BASE_URL": services.url,
+        "OPENAI_API_KEY": "fake", "OPENAI_API_BASE": f"{services.url}/v1", "OPENAI_BASE_URL": f"{services.url}/v1",
+        "NVIDIA_API_KEY": "nvapi-fake",
+    })
+    from scenarios import SCENARIOS
+
+    rec = Recorder()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = {"status": "ok"}
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            SCENARIOS[name](rec, services, repeat, Path(workdir))
+    except ImportError as e:
+        result = {"status": "skipped", "reason": f"missing dependency: {e}"}
+    except Exception as e:
+        result = {"status": "error", "reason": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc()}
+    finally:
+        services.stop()
+
+    return {
+        **result,
+        "seconds": round(time.perf_counter() - start, 3),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),  # KiB on Linux
+        "stages": rec.summary(),
+        "services": {api: dict(counts) for api, counts in services.stats.items()},
+    }
+
+
+def run_in_worker(name: str, args) -> dict:
+    """Each scenario runs in its own interpreter: clean imports, env and memory high-water mark"""
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        result_path = f.name
+    command = [sys.executable, str(HERE / "run.py"), "--worker", name, "--result-file", result_path,
+               "--profile", args.profile, "--repeat", str(args.repeat)]
+    for flag in ("ttft_ms", "tokens_per_s", "embed_ms"):
+        if getattr(args, flag) is not None:
+            command += [f"--{flag.replace('_', '-')}", str(getattr(args, flag))]
+    try:
+        proc = subprocess.run(command, cwd=HERE, timeout=args.timeout, capture_output=not args.verbose, text=True)
+        if proc.returncode != 0:
+            return {"status": "error", "reason": f"worker exited with {proc.returncode}",
+                    "traceback": (proc.stderr or "")[-4000:]}
+        return json.loads(Path(result_path).read_text())
+    except subprocess.TimeoutExpired:
+        return {"status": "error", "reason": f"timed out after {args.timeout}s"}
+    finally:
+        Path(result_path).unlink(missing_ok=True)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Print per-stage mean latency changes; returns the stages that got slower by more than threshold"""
+    regressions = []
+    print(f"\n{'scenario / stage':<58} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            print(f"{name:<58} {'(new)':>10}")
+            continue
+        if before["status"] != result["status"]:
+            print(f"{name:<58} {before['status']:>10} {result['status']:>10}")
+        for stage, stats in result.get("stages", {}).items():
+            old = before.get("stages", {}).get(stage)
+            label = f"  {name} / {stage}"
+            if old is None:
+                print(f"{label:<58} {'(new)':>10} {stats['mean_s']:>9.3f}s")
+                continue
+            change = (stats["mean_s"] - old["mean_s"]) / max(old["mean_s"], 1e-9)
+            flag = " !" if change > threshold else ""
+            print(f"{label:<58} {old['mean_s']:>9.3f}s {stats['mean_s']:>9.3f}s {change:>+7.1%}{flag}")
+            if change > threshold:
+                regressions.append(f"{name} / {stage}")
+    return regressions
+
+
+def print_results(results: dict):
+    for name, result in results["scenarios"].items():
+        reason = f" ({result['reason']})" if result.get("reason") else ""
+        print(f"\n{name}: {result['status']}{reason}  {result.get('seconds', 0):.1f}s, "
+              f"max RSS {result.get('max_rss_mb', 0):.0f} MB")
+        for stage, stats in result.get("stages", {}).items():
+            print(f"  {stage:<40} x{stats['calls']:<3} mean {stats['mean_s']:8.3f}s  p50 {stats['p50_s']:8.3f}s  "
+                  f"{stats['items_per_s']:9.1f} items/s  peak {stats['peak_mb']:7.1f} MB")
+
+
+def main():
+    from scenarios import SCENARIOS  # only the registry; scenarios import their heavy deps lazily
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma separated, default: all")
+    parser.add_argument("--profile", default="fast", choices=sorted(PROFILES))
+    parser.add_argument("--ttft-ms", type=float, help="override the profile's time to first token")
+    parser.add_argument("--tokens-per-s", type=float, help="override the profile's generation speed")
+    parser.add_argument("--embed-ms", type=float, help="override the profile's per-text embedding time")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default=str(HERE / "results" / "latest.json"))
+    parser.add_argument("--compare", help="baseline JSON to diff against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown reported as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--timeout", type=int, default=1800, help="seconds per scenario")
+    parser.add_argument("--verbose", action="store_true", help="show the scenarios' own output")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    overrides = {k: getattr(args, k) for k in ("ttft_ms", "tokens_per_s", "embed_ms") if getattr(args, k) is not None}
+    profile = replace(PROFILES[args.profile], **overrides)
+
+    if args.worker:
+        Path(args.result_file).write_text(json.dumps(run_scenario(args.worker, profile, args.repeat)))
+        return
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))} (available: {', '.join(SCENARIOS)})")
+
+    results = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "profile": {"name": args.profile, **asdict(profile)},
+            "repeat": args.repeat,
+        },
+        "scenarios": {},
+    }
+    for name in names:
+        print(f"running {name} ...", flush=True)
+        results["scenarios"][name] = run_in_worker(name, args)
+
+    print_results(results)
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, indent=2, ensure_ascii=False))
+    print(f"\nResults written to {out}")
+
+    if args.compare:
+        regressions = compare(json.loads(Path(args.compare).read_text()), results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) slower than the baseline by more than {args.threshold:.0%}")
+            if args.fail_on_regression:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""Benchmark scenarios. Each loads a project's real pipeline code and drives it against FakeServices;
+only the network endpoints (and, where a pipeline would download model files, the tokenizer/embedder) are swapped."""
+
+import asyncio
+import functools
+import importlib
+import itertools
+import json
+import random
+import re
+import sys
+from pathlib import Path
+
+
+from fake_servers import lorem
+from loader import load_definitions
+
+ROOT = Path(__file__).resolve().parent.parent
+SCENARIOS = {}
+
+
+def scenario(name: str):
+    """Register fn(rec, services, repeat, workdir) under `name`"""
+    def register(fn):
+        SCENARIOS[name] = fn
+        return fn
+    return register
+
+
+def import_project_module(project: str, module: str):
+    path = str(ROOT / project)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return importlib.import_module(module)
+
+
+def offline_openai_embeddings(base_url: str):
+    """The langchain_community OpenAIEmbeddings, minus the tiktoken length check (its encodings are downloaded)"""
+    from langchain_community.embeddings import OpenAIEmbeddings
+
+    class DirectOpenAIEmbeddings(OpenAIEmbeddings):
+        def embed_documents(self, texts, chunk_size=0):
+            response = self.client.create(input=texts, **self._invocation_params)
+            return [item.embedding for item in response.data]
+
+    return DirectOpenAIEmbeddings(openai_api_key="fake", openai_api_base=base_url)
+
+
+def with_thinking(text: str, seed: str = "") -> str:
+    """Reasoning models (deepseek-r1) prefix their answer with a <think> block the pipelines strip"""
+    return f"<think>{lorem(48, seed)}</think>\n{text}"
+
+
+@scenario("audio_assistant")
+def audio_assistant(rec, services, repeat, workdir):
+    """code.py: index a transcript, then answer questions with generate_answer (Ollama LLM + embeddings)"""
+    ns = load_definitions(ROOT / "202505_Audio_Assistant" / "code.py",
+                          skip_names={"WHISPER_MODEL", "DEVICE", "tts", "answer"},
+                          skip_modules={"torch", "whisper", "TTS", "IPython"})
+    services.responder = lambda api, prompt: with_thinking(lorem(60, prompt), prompt)
+    transcript = ". ".join(lorem(12, str(i)) for i in range(400))
+
+    with rec.stage("process_text", items=len(ns["TEXT_SPLITTER"].split_text(transcript))):
+        ns["process_text"](transcript)
+    for i in range(repeat):
+        with rec.stage("generate_answer"):
+            ns["generate_answer"](f"What are the three AI projects mentioned? ({i})")
+
+
+@scenario("youtube_transcript")
+def youtube_transcript(rec, services, repeat, workdir):
+    """transcript.py: caption discovery, fetch and trimming through youtube_transcript_api"""
+    import requests
+    from youtube_transcript_api import YouTubeTranscriptApi
+
+    class RedirectSession(requests.Session):
+        """requests session that sends youtube.com traffic to the caption stand-in"""
+
+        def request(self, method, url, *args, **kwargs):
+            return super().request(method, re.sub(r"^https://(www\.)?youtube\.com", services.url, url), *args, **kwargs)
+
+    transcript = import_project_module("202602_YouTube_Language_Tutor", "transcript")
+    transcript.YouTubeTranscriptApi = functools.partial(YouTubeTranscriptApi, http_client=RedirectSession())
+    url = "https://www.youtube.com/watch?v=benchVideo01"
+
+    for _ in range(repeat):
+        with rec.stage("get_available_languages"):
+            transcript.get_available_languages(url)
+        with rec.stage("fetch_transcript", items=services.caption_snippets):
+            text = transcript.fetch_transcript(url, "sv")
+        with rec.stage("chunk_if_needed"):
+            transcript.chunk_if_needed(text)
+
+
+def tutor_responder(api: str, prompt: str) -> str:
+    if "===QUESTIONS===" in prompt:
+        return (f"===QUESTIONS===\n1. {lorem(10, prompt)}?\n2. {lorem(10, prompt[::-1])}?\n"
+                f"===VOCABULARY===\n" + "\n\n".join(f"**{w}**\nMeaning: {lorem(4, w)}" for w in lorem(5, prompt).split()))
+    return lorem(80, prompt)
+
+
+@scenario("youtube_tutor")
+def youtube_tutor(rec, services, repeat, workdir):
+    """tutor.py: _call, question/answer generation and a multi-turn ChatSession against the Gemini API,
+    with the full transcript in the prompt and with retrieval.py's timestamped index (BM25, then + embeddings).
+    Prompt sizes per variant are reported under services.tutor_prompt_chars."""
+    tutor = import_project_module("202602_YouTube_Language_Tutor", "tutor")
+    retrieval = import_project_module("202602_YouTube_Language_Tutor", "retrieval")
+    services.responder = tutor_responder
+    snippets = [{"text": lorem(12, str(i)) + ".", "start": i * 4.0, "duration": 4.0} for i in range(200)]
+    transcript = " ".join(s["text"] for s in snippets)
+    gemini = services.stats["gemini"]
+
+    def chat(session, variant: str):
+        before = gemini["prompt_chars"]
+        for turn in range(6):
+            with rec.stage(f"ChatSession.send ({variant})"):
+                session.send(f"Vad betyder {lorem(3, str(turn * 7))}?")
+        services.count("tutor_prompt_chars", **{f"chat_{variant}": gemini["prompt_chars"] - before})
+        return session
+
+    for _ in range(repeat):
+        with rec.stage("_call"):
+            tutor._call("You are a Swedish tutor.", "Say hello in one sentence.")
+        with rec.stage("generate_questions_and_vocabulary"):
+            questions, _ = tutor.generate_questions_and_vocabulary(transcript, "Swedish")
+        with rec.stage("generate_answers"):
+            tutor.generate_answers(questions, "Swedish", transcript)
+        session = chat(tutor.ChatSession(transcript, "Swedish"), "full")
+
+        with rec.stage("load_index (build)", items=len(snippets)):
+            index = retrieval.load_index("bench", "sv", lambda: snippets, cache_dir=workdir / "bm25")
+        with rec.stage("load_index (build + embed)", items=len(snippets)):
+            dense = retrieval.load_index("bench", "sv", lambda: snippets, tutor.embed_texts, workdir / "dense")
+        with rec.stage("load_index (cached)"):
+            retrieval.load_index("bench", "sv", lambda: snippets, tutor.embed_texts, workdir / "dense")
+        with rec.stage("TranscriptIndex.search", items=50):
+            for i in range(50):
+                index.search(lorem(6, str(i)))
+        with rec.stage("generate_answers (retrieval)"):
+            tutor.generate_answers(questions, "Swedish", transcript, index)
+        chat(tutor.ChatSession(transcript, "Swedish", index), "bm25")
+        chat(tutor.ChatSession(transcript, "Swedish", dense), "bm25_embeddings")
+        for cache in ("bm25", "dense"):  # rebuilt on the next repeat
+            (workdir / cache / "bench_sv.json").unlink()
+
+        with rec.stage("summarise_chat"):
+            tutor.summarise_chat("Swedish", session.exchanges)
+
+
+def flyer_responder(products: list[tuple[str, str]]):
+    def respond(api: str, prompt: str) -> str:
+        if "Classify this document" in prompt:
+            return json.dumps({"classification": "grocery" if "DEALS" in prompt else "general"})
+        if "extract products on discount" in prompt:
+            return json.dumps([{"product": p, "category": c} for p, c in products if p in prompt])
+        return with_thinking(lorem(150, prompt), prompt)  # summaries and meal plans
+    return respond
+
+
+@scenario("agent_workflow")
+def agent_workflow(rec, services, repeat, workdir):
+    """agent_app.ipynb: PDFProcessor stages on a synthetic 8-page flyer, then the full LangGraph workflow"""
+    ns = load_definitions(ROOT / "202504_Agent_workflow" / "agent_app.ipynb",
+                          skip_names={"dot"}, skip_modules={"graphviz"})
+    pdf_pages = ns["pdf_pages"]
+    services.responder = flyer_responder(pdf_pages.PRODUCTS)
+    n_pages = 8
+    flyer = pdf_pages.make_synthetic_flyer(str(workdir / "flyer.pdf"), n_pages=n_pages)
+    processor = ns["PDFProcessor"]()
+
+    for _ in range(repeat):
+        with rec.stage("extract_text", items=n_pages):
+            text = processor.extract_text(flyer)
+        with rec.stage("classify_flyer"):
+            processor.classify_flyer(text)
+        with rec.stage("parse_discounts"):
+            processor.parse_discounts(text)
+        with rec.stage("process", items=n_pages):
+            state = processor.process(flyer)
+        with rec.stage("workflow.ainvoke"):
+            asyncio.run(ns["create_workflow"]().ainvoke(
+                {**state, "summary": None, "meal_plan": None, "user_message": None, "timings": {}}))
+
+
+def loan_responder(api: str, prompt: str) -> str:
+    if "classify whether the following query is asking about an application" in prompt:
+        return "yes"
+    if "extract and only return the application ID" in prompt:
+        digits = re.findall(r"\d+", prompt)
+        return digits[0] if digits else "3"
+    return lorem(60, prompt)
+
+
+@scenario("loan_chatbot")
+def loan_chatbot(rec, services, repeat, workdir):
+    """rag_chatbot.ipynb: embedding index sync and handle_customer_query for each routing path"""
+    from langchain_community.chat_models import ChatOpenAI
+
+    project = "202501_Loan_application_chatbot"
+    ApplicationEmbeddingIndex = import_project_module(project, "embedding_index").ApplicationEmbeddingIndex
+    load_application_index = import_project_module(project, "application_lookup").load_application_index
+
+    class WordCountChatOpenAI(ChatOpenAI):
+        """Counts tokens by words, so memory pruning doesn't need tiktoken's downloaded encodings"""
+
+        def get_num_tokens(self, text: str) -> int:
+            return len(text.split())
+
+        def get_num_tokens_from_messages(self, messages, tools=None) -> int:
+            return sum(len(str(message.content).split()) for message in messages)
+
+    base_url = f"{services.url}/v1"
+    embedding = offline_openai_embeddings(base_url)
+    llm = WordCountChatOpenAI(temperature=0.0, model="gpt-3.5-turbo-0125", openai_api_key="fake", openai_api_base=base_url)
+
+    rows = load_application_index(str(ROOT / project / "loan_applications.csv"))
+    index = ApplicationEmbeddingIndex(str(workdir / "loan_index"), embedding)
+    with rec.stage("index.sync (cold)", items=len(rows)):
+        index.sync(rows)
+    with rec.stage("index.sync (warm)", items=len(rows)):
+        index.sync(rows)
+
+    ns = load_definitions(ROOT / project / "rag_chatbot.ipynb",
+                          namespace={"openai_key": "fake", "embedding_model": embedding, "index": index, "llm": llm})
+    services.responder = loan_responder
+    queries = {
+        "fast_path": "my application id is 2",
+        "no_id": "I lost my credit card",
+        "ambiguous": "my id is three, why was it declined?",
+        "unknown_id": "application id is 99",
+    }
+    for _ in range(repeat):
+        for kind, query in queries.items():
+            ns["memory"].clear()
+            with rec.stage(f"handle_customer_query[{kind}]"):
+                ns["handle_customer_query"](query)
+
+
+def feature_code_responder():
+    counter = itertools.count()
+
+    def respond(api: str, prompt: str) -> str:
+        match = re.search(r"- Numeric: (\[.*?\])", prompt)
+        numeric = json.loads(match.group(1)) if match else []
+        rng = random.Random(next(counter))
+        lines = []
+        for _ in range(2):
+            a, b = rng.sample(numeric, 2)
+            name = re.sub(r"\W+", "_", f"{a}_per_{b}").lower()
+            lines.append(f'    df["{name}"] = df["{a}"] / (df["{b}"] + 1e-9)')
+        return with_thinking("```python\ndef create_features(df):\n" + "\n".join(lines) + "\n    return df\n```", prompt)
+
+    return respond
+
+
+def synthetic_credit_data(n_rows: int = 1000, seed: int = 0):
+    """German-credit shaped frame with a target that depends on a ratio the LLM can discover"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Age": rng.integers(19, 75, n_rows),
+        "Sex": rng.choice(["male", "female"], n_rows),
+        "Job": rng.integers(0, 4, n_rows),
+        "Housing": rng.choice(["own", "rent", "free"], n_rows),
+        "Credit amount": rng.gamma(2.0, 1500.0, n_rows).round(),
+        "Duration": rng.integers(4, 72, n_rows),
+    })
+    risk = df["Credit amount"] / df["Duration"] / 150 - df["Age"] / 60 + rng.normal(0, 0.5, n_rows)
+    df["class"] = (risk > np.median(risk)).astype(int)
+    return df.drop(columns=["class"]), df["class"]
+
+
+@scenario("fe_pipeline")
+def fe_pipeline(rec, services, repeat, workdir):
+    """llm_fe_ml.ipynb: concurrent code proposals, sandboxed execution and greedy CV selection"""
+    ns = load_definitions(ROOT / "202509_LLM_FE_ML_Pipeline" / "llm_fe_ml.ipynb", cells=[1, 3],
+                          skip_modules={"kagglehub"})
+    config = ns["CONFIG"]
+    services.responder = feature_code_responder()
+    X, y = synthetic_credit_data()
+
+    for r in range(repeat):
+        config.cache_dir = str(workdir / f"llm_cache_{r}")  # a cold cache every round
+        prompt = ns["build_feature_code_prompt"](X, "class")
+        with rec.stage("propose_feature_code", items=config.n_samples):
+            codes = [ns["extract_code"](future.result()) for future in ns["propose_feature_code"](prompt)]
+
+        with rec.stage("run_feature_code", items=len(codes)):
+            candidates, new_cols = X.copy(), []
+            for code in codes:
+                out, cols = ns["run_feature_code"](code, X)
+                for col in cols:
+                    if col not in candidates.columns:
+                        candidates[col] = out[col]
+                        new_cols.append(col)
+
+        with rec.stage("cv_auc"):
+            base_auc = ns["cv_auc"](X, y)
+        with rec.stage("keep_up_to_n_improving", items=len(new_cols)):
+            ns["keep_up_to_n_improving"](X, y, new_cols, candidates, base_auc, config.n_per_round)
+
+
+def invoice_responder(api: str, prompt: str) -> str:
+    rng = random.Random(prompt)
+    transactions = [
+        {"date": f"2025-02-{day:02d}", "description": rng.choice(["Hemköp", "SL", "Cinema", "Pizza", "Apotek"]),
+         "category": rng.choice(["Groceries", "Entertainment", "Restaurants", "Transportation", "Other"]),
+         "amount": round(rng.uniform(20, 900), 2)}
+        for day in range(1, 29)
+    ]
+    return with_thinking("```json\n" + json.dumps({"transactions": transactions}, ensure_ascii=False) + "\n```", prompt)
+
+
+@scenario("deepseek_app")
+def deepseek_app(rec, services, repeat, workdir):
+    """deepseek_streamlit_app.py: load_data (PDF load, split, FAISS index, RetrievalQA via NVIDIA NIM, JSON parse)"""
+    from langchain_nvidia_ai_endpoints import ChatNVIDIA
+
+    base_url = f"{services.url}/v1"
+    ns = load_definitions(
+        ROOT / "202503_Local_DeepSeek_app" / "deepseek_streamlit_app.py",
+        namespace={
+            "ChatNVIDIA": functools.partial(ChatNVIDIA, base_url=base_url),
+            # HuggingFaceEmbeddings would download a sentence-transformers model
+            "HuggingFaceEmbeddings": lambda: offline_openai_embeddings(base_url),
+        },
+        skip_names={"deepseek_api", "uploaded_file"},
+        strip_decorators=True,  # st.cache_data would serve every repeat from cache
+    )
+    services.responder = invoice_responder
+    pdf_pages = import_project_module("202504_Agent_workflow", "pdf_pages")
+    n_pages = 6
+    pdf_bytes = Path(pdf_pages.make_synthetic_flyer(str(workdir / "invoice.pdf"), n_pages=n_pages)).read_bytes()
+
+    for _ in range(repeat):
+        with rec.stage("load_data", items=n_pages):
+            if ns["load_data"](pdf_bytes, "fake") is None:
+                raise RuntimeError("load_data failed (see the Streamlit error above)")